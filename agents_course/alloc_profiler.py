@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Opt-in allocation profiling for long-running agent sessions.
+Uses tracemalloc to measure what each agent.run() leaves behind, takes a full
+snapshot every N runs, and groups the results by module (this project's agents,
+smolagents, LiteLLM, requests, ...) so growth can be attributed.
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+
+# Package directories or module names mapped to the group they are reported under.
+# The first match wins.
+MODULE_GROUPS = [
+    ("weather_enhanced_agent", "weather_enhanced_agent"),
+    ("enhanced_agent", "enhanced_agent"),
+    ("simple_math_agent", "simple_math_agent"),
+    ("result_store", "result_store"),
+    ("search_extraction", "search_extraction"),
+    ("smolagents", "smolagents"),
+    ("litellm", "litellm"),
+    ("openai", "litellm"),
+    ("httpx", "litellm"),
+    ("requests", "requests"),
+    ("urllib3", "requests"),
+]
+
+
+def module_group(filename):
+    """Return the report group for a source file.
+
+    Only whole path segments match: a file inside a ``requests/`` directory or a
+    module called ``enhanced_agent.py``, not ``/home/u/requests-demo/``.
+    """
+    normalized = "/" + filename.replace("\\", "/").lstrip("/")
+    for fragment, group in MODULE_GROUPS:
+        if f"/{fragment}/" in normalized or normalized.endswith(f"/{fragment}.py"):
+            return group
+    return "other"
+
+
+def attribute(traceback):
+    """Return (group, frame) for the innermost frame of a traceback that belongs to a known module.
+
+    Memory allocated by the standard library on behalf of, say, search_extraction is
+    credited to search_extraction. Tracebacks with no known module fall back to
+    ("other", innermost frame).
+    """
+    for frame in reversed(traceback):
+        group = module_group(frame.filename)
+        if group != "other":
+            return group, frame
+    return "other", traceback[-1]
+
+
+def group_stats(stats):
+    """Sum ``tracemalloc`` statistics (or statistic diffs) by module group.
+
+    Returns a list of (group, size, count) tuples, largest first. For diffs the
+    size and count are the change since the previous snapshot.
+    """
+    groups = {}
+    for stat in stats:
+        group, _ = attribute(stat.traceback)
+        size, count = groups.get(group, (0, 0))
+        groups[group] = (
+            size + getattr(stat, "size_diff", stat.size),
+            count + getattr(stat, "count_diff", stat.count),
+        )
+    return sorted(((group, size, count) for group, (size, count) in groups.items()),
+                  key=lambda item: abs(item[1]), reverse=True)
+
+
+def format_size(size):
+    """Render a byte count (possibly negative) for humans."""
+    sign = "-" if size < 0 else "+"
+    size = abs(size)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{sign}{size:.1f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.1f} GiB"
+
+
+def read_rss():
+    """Current resident set size in bytes, or None if it can't be read on this platform."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class AllocationProfiler:
+    """Tracks allocations across agent runs.
+
+    Tracebacks are ``frames`` deep so that memory allocated by the standard library
+    or a dependency can be credited to the project module that asked for it.
+    Wrap each run with ``profile_run()``; every ``snapshot_every`` runs the growth
+    since the previous periodic snapshot is printed (or written to ``report_path``).
+    ``dump()`` prints a report on demand, and ``install_signal_handler()`` makes
+    SIGUSR1 do the same from outside the process (e.g. ``kill -USR1 <pid>``).
+    """
+
+    def __init__(self, snapshot_every=10, top=10, frames=25, report_path=None):
+        self.snapshot_every = snapshot_every
+        self.top = top
+        self.frames = frames
+        self.report_path = report_path
+
+        # (run number, duration, bytes retained by the run, rss) for the runs in the next report
+        self.runs = deque(maxlen=snapshot_every)
+        self._run_count = 0
+        self._baseline = None
+        self._last_periodic = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Create a profiler if AGENT_MEMPROFILE is set, otherwise return None.
+
+        AGENT_MEMPROFILE is the number of runs between snapshots ("1" or more, "0"
+        turns profiling off), and AGENT_MEMPROFILE_REPORT optionally names a file to
+        append reports to. Any other value raises ValueError.
+        """
+        value = os.getenv("AGENT_MEMPROFILE", "").strip()
+        if not value:
+            return None
+        if not value.isdigit():
+            raise ValueError(f"AGENT_MEMPROFILE must be a number of runs (or 0 to turn profiling off), got '{value}'")
+        snapshot_every = int(value)
+        if snapshot_every == 0:
+            return None
+        return cls(snapshot_every=snapshot_every, report_path=os.getenv("AGENT_MEMPROFILE_REPORT") or None)
+
+    def start(self):
+        """Start tracing allocations and take the baseline snapshot."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._baseline = self._snapshot()
+        self._last_periodic = self._baseline
+        return self
+
+    def stop(self):
+        """Stop tracing allocations."""
+        tracemalloc.stop()
+
+    def profile_run(self, run, *args, **kwargs):
+        """Call ``run(*args, **kwargs)`` and record the memory it retained."""
+        if self._baseline is None:
+            self.start()
+
+        before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            return run(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            after, _ = tracemalloc.get_traced_memory()
+
+            with self._lock:
+                self._run_count += 1
+                self.runs.append((self._run_count, duration, after - before, read_rss()))
+                periodic = self._run_count % self.snapshot_every == 0
+
+            if periodic:
+                snapshot = self._snapshot()
+                self._emit(self._diff_report(
+                    f"Allocation growth over the last {self.snapshot_every} runs", snapshot, self._last_periodic
+                ))
+                self._last_periodic = snapshot
+
+    def dump(self):
+        """Print (or write) a report of allocation growth since profiling started."""
+        if self._baseline is None:
+            self.start()
+        self._emit(self._diff_report("Allocation growth since start", self._snapshot(), self._baseline))
+
+    def install_signal_handler(self, signum=None):
+        """Dump a report whenever the process receives SIGUSR1 (where available)."""
+        signum = signum or getattr(signal, "SIGUSR1", None)
+        if signum is None:
+            return False
+
+        def handle(received, frame):
+            # Build the report off the signal handler, which may interrupt a run at any point
+            threading.Thread(target=self.dump, name="alloc-profiler-dump", daemon=True).start()
+
+        signal.signal(signum, handle)
+        return True
+
+    def _snapshot(self):
+        """Take a snapshot of all traced allocations."""
+        return tracemalloc.take_snapshot()
+
+    def _diff_report(self, title, snapshot, previous):
+        """Build the text report for the growth between two snapshots."""
+        # Leave out the profiler's own bookkeeping. Plain filename checks are much faster
+        # than Snapshot.filter_traces() with deep tracebacks.
+        diff = [
+            stat for stat in snapshot.compare_to(previous, "traceback")
+            if stat.traceback[-1].filename not in (tracemalloc.__file__, __file__)
+        ]
+        current, peak = tracemalloc.get_traced_memory()
+        rss = read_rss()
+
+        lines = [
+            f"🧠 {title}",
+            "=" * 60,
+            f"Runs: {self._run_count}   Traced: {current / 1024 / 1024:.1f} MiB "
+            f"(peak {peak / 1024 / 1024:.1f} MiB)"
+            + (f"   RSS: {rss / 1024 / 1024:.1f} MiB" if rss else ""),
+            "",
+            "By module:",
+        ]
+        for group, size, count in group_stats(diff):
+            if size:
+                lines.append(f"  {group:<24} {format_size(size):>12}  {count:+d} blocks")
+
+        lines.append("")
+        lines.append(f"Top {self.top} lines:")
+        for stat in diff[:self.top]:
+            group, frame = attribute(stat.traceback)
+            lines.append(f"  {format_size(stat.size_diff):>12}  {group:<24} {frame.filename}:{frame.lineno}")
+
+        recent = list(self.runs)
+        if recent:
+            lines.append("")
+            lines.append("Recent runs (retained by each run):")
+            for number, duration, retained, run_rss in recent:
+                rss_text = f"  RSS {run_rss / 1024 / 1024:.1f} MiB" if run_rss else ""
+                lines.append(f"  #{number:<5} {duration:6.2f}s  {format_size(retained):>12}{rss_text}")
+
+        return "\n".join(lines)
+
+    def _emit(self, report):
+        """Print a report, or append it to the report file."""
+        if self.report_path:
+            with open(self.report_path, "a") as f:
+                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\n{report}\n\n")
+        else:
+            print(report, file=sys.stderr)
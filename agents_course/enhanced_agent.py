@@ -5,29 +5,41 @@ This agent has tools to add numbers and perform web searches.
 """
 
 import requests
+import os
 from smolagents import Tool, ToolCallingAgent, LiteLLMModel
+from alloc_profiler import AllocationProfiler
+from numeric_engine import NumericEngine
+from search_extraction import SearchExtractor, read_json_stream
 
 
 class AddNumbersTool(Tool):
     """A simple tool to add two numbers."""
     
     name = "add_numbers"
-    description = "Adds two numbers together. Takes two numeric inputs and returns their sum."
+    description = "Adds two numbers together. Takes two numeric inputs and returns their sum as a string. Pass numbers as strings (e.g. '0.1') to keep full precision."
     inputs = {
         "a": {
-            "type": "number",
-            "description": "The first number to add"
+            "type": ["string", "number", "integer"],
+            "description": "The first number to add, e.g. '0.1', '12345678901234567890' or '1/3'"
         },
         "b": {
-            "type": "number", 
+            "type": ["string", "number", "integer"],
             "description": "The second number to add"
         }
     }
-    output_type = "number"
+    output_type = "string"
+    
+    def __init__(self, mode=None, precision=None, *args, **kwargs):
+        """Create the tool. ``mode`` is "float", "decimal" or "exact" (see numeric_engine)."""
+        super().__init__(*args, **kwargs)
+        self.engine = NumericEngine(mode, precision)
     
-    def forward(self, a: float, b: float) -> float:
+    def forward(self, a: str, b: str) -> str:
         """Add two numbers together."""
-        return a + b
+        try:
+            return self.engine.format(self.engine.add(a, b))
+        except (ValueError, ArithmeticError) as e:
+            return f"Error adding numbers: {str(e)}"
 
 
 class WebSearchTool(Tool):
@@ -43,54 +55,49 @@ class WebSearchTool(Tool):
     }
     output_type = "string"
     
+    def __init__(self, max_tokens=200, *args, **kwargs):
+        """Create the tool. ``max_tokens`` caps the size of each search result."""
+        super().__init__(*args, **kwargs)
+        self.extractor = SearchExtractor(max_tokens=max_tokens)
+    
     def forward(self, query: str) -> str:
         """Perform a web search and return relevant information."""
         try:
-            # Using DuckDuckGo Instant Answer API (no API key required)
-            url = "https://api.duckduckgo.com/"
-            params = {
-                'q': query,
-                'format': 'json',
-                'no_html': '1',
-                'skip_disambig': '1'
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Extract relevant information
-            result_parts = []
+            # Repeat queries are answered from the in-memory cache
+            cached = self.extractor.cached(query)
+            if cached is not None:
+                return cached
             
-            # Add abstract if available
-            if data.get('Abstract'):
-                result_parts.append(f"Summary: {data['Abstract']}")
+            data = self._fetch_results(query)
             
-            # Add answer if available
-            if data.get('Answer'):
-                result_parts.append(f"Answer: {data['Answer']}")
-            
-            # Add related topics if available
-            if data.get('RelatedTopics') and len(data['RelatedTopics']) > 0:
-                topics = data['RelatedTopics'][:3]  # Limit to first 3
-                topic_texts = []
-                for topic in topics:
-                    if isinstance(topic, dict) and topic.get('Text'):
-                        topic_texts.append(topic['Text'])
-                if topic_texts:
-                    result_parts.append(f"Related: {'; '.join(topic_texts)}")
+            # Rank, de-duplicate and trim the snippets to the token budget
+            result = self.extractor.extract(data, query)
             
             # If no specific results, provide a general response
-            if not result_parts:
-                result_parts.append(f"I searched for '{query}' but couldn't find specific information. You might want to try a more specific search term.")
+            if result is None:
+                result = f"I searched for '{query}' but couldn't find specific information. You might want to try a more specific search term."
             
-            return "\n".join(result_parts)
+            return result
             
         except requests.RequestException as e:
             return f"Error performing web search: {str(e)}"
         except Exception as e:
             return f"Unexpected error during web search: {str(e)}"
+    
+    def _fetch_results(self, query):
+        """Call the DuckDuckGo Instant Answer API and return the decoded JSON."""
+        # Using DuckDuckGo Instant Answer API (no API key required)
+        url = "https://api.duckduckgo.com/"
+        params = {
+            'q': query,
+            'format': 'json',
+            'no_html': '1',
+            'skip_disambig': '1'
+        }
+        
+        with requests.get(url, params=params, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            return read_json_stream(response.iter_content(chunk_size=16384))
 
 
 def create_enhanced_agent():
@@ -129,6 +136,17 @@ def main():
     print("   • web_search (searches the web for information)")
     print("\n" + "="*60)
     
+    # Opt-in allocation profiling (AGENT_MEMPROFILE=<runs between snapshots>)
+    profiler = AllocationProfiler.from_env()
+    if profiler is not None:
+        profiler.start()
+        print(f"🧠 Memory profiling on: report every {profiler.snapshot_every} runs")
+        if profiler.install_signal_handler():
+            print(f"   Dump a report with 'memdump' or: kill -USR1 {os.getpid()}")
+        else:
+            print("   Dump a report with 'memdump'")
+        print("-" * 60)
+    
     # Example usage
     while True:
         try:
@@ -140,12 +158,19 @@ def main():
             
             if not user_input.strip():
                 continue
+            
+            if profiler is not None and user_input.strip().lower() == 'memdump':
+                profiler.dump()
+                continue
                 
             print(f"\n🤔 Processing: {user_input}")
             print("-" * 40)
             
             # Run the agent
-            result = agent.run(user_input)
+            if profiler is not None:
+                result = profiler.profile_run(agent.run, user_input)
+            else:
+                result = agent.run(user_input)
             
             print("-" * 40)
             print(f"✅ Result: {result}")
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Load generator for the weather enhanced agent.
+Drives N concurrent virtual users at a configurable arrival rate and reports
+throughput, latency histograms, error rates and queue depth over time.
+By default the LLM and the tool backends are local mocks, so no Ollama or network is needed.
+"""
+
+import argparse
+import json
+import math
+import queue
+import random
+import re
+import threading
+import time
+
+import requests
+from smolagents import ChatMessage, LogLevel, MessageRole, Model
+
+from weather_enhanced_agent import create_weather_enhanced_agent
+
+
+DEFAULT_QUERIES = [
+    "What is the weather in London today?",
+    "How's the weather in New York?",
+    "Tell me about the weather in Tokyo",
+    "What's 15 + 25?",
+    "Who is Albert Einstein?",
+]
+
+# Upper bounds (ms) of the latency histogram buckets
+HISTOGRAM_BUCKETS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, math.inf]
+
+
+class MockModel(Model):
+    """A stand-in LLM that picks a tool from keywords, then returns its output as the final answer."""
+
+    def __init__(self, latency=0.2, **kwargs):
+        super().__init__(model_id="mock", **kwargs)
+        self.latency = latency
+
+    def generate(self, messages, stop_sequences=None, response_format=None, tools_to_call_from=None, **kwargs):
+        """Return a tool call as JSON text, which the agent parses like a real model's reply."""
+        time.sleep(random.expovariate(1 / self.latency) if self.latency > 0 else 0)
+
+        last = messages[-1]
+        role = last.role if isinstance(last, ChatMessage) else last["role"]
+        content = last.content if isinstance(last, ChatMessage) else last["content"]
+        text = content if isinstance(content, str) else " ".join(part.get("text", "") for part in content or [])
+
+        # A tool has answered, so finish with its output
+        if getattr(role, "value", role) == MessageRole.TOOL_RESPONSE.value:
+            answer = re.sub(r"^Observation:\s*", "", text.strip())
+            call = {"name": "final_answer", "arguments": {"answer": answer[:500]}}
+        else:
+            call = self._pick_tool(text.split("New task:")[-1].strip())
+
+        return ChatMessage(role=MessageRole.ASSISTANT, content=json.dumps(call))
+
+    def _pick_tool(self, task):
+        """Choose a tool call for the user's task."""
+        numbers = re.findall(r"-?\d+(?:\.\d+)?", task)
+        if "weather" in task.lower():
+            match = re.search(r"weather (?:like )?in ([A-Z][\w ]*?)(?: today)?[?.!]*$", task)
+            return {"name": "get_weather", "arguments": {"city": match.group(1) if match else "London"}}
+        if len(numbers) >= 2:
+            return {"name": "add_numbers", "arguments": {"a": numbers[-2], "b": numbers[-1]}}
+        return {"name": "web_search", "arguments": {"query": task}}
+
+
+def install_mock_backends(agent, latency=0.1):
+    """Replace the agent's network calls with local fakes that sleep for ``latency`` seconds."""
+
+    def wait():
+        time.sleep(random.expovariate(1 / latency) if latency > 0 else 0)
+
+    def fetch_results(query):
+        wait()
+        return {"Abstract": f"Mock summary for {query}.", "RelatedTopics": [{"Text": f"Mock topic about {query}."}]}
+
+    def fetch_weather(city, api_key):
+        wait()
+        return {
+            "main": {"temp": 20, "feels_like": 21, "humidity": 70, "pressure": 1013},
+            "weather": [{"description": "partly cloudy"}],
+            "wind": {"speed": 2.5},
+        }
+
+    weather_tool = agent.tools["get_weather"]
+    demo_weather = weather_tool._get_demo_weather
+
+    def get_demo_weather(city):
+        wait()
+        return demo_weather(city)
+
+    agent.tools["web_search"]._fetch_results = fetch_results
+    weather_tool._fetch_weather = fetch_weather
+    weather_tool._get_demo_weather = get_demo_weather
+
+
+class LoadTest:
+    """Open-loop load test: requests arrive at ``rate`` per second into a queue served by ``users`` workers."""
+
+    def __init__(self, users=10, rate=5.0, duration=30.0, queries=None, endpoint=None,
+                 mock=True, llm_latency=0.2, tool_latency=0.1, sample_interval=1.0):
+        self.users = users
+        self.rate = rate
+        self.duration = duration
+        self.queries = queries or DEFAULT_QUERIES
+        self.endpoint = endpoint
+        self.mock = mock
+        self.llm_latency = llm_latency
+        self.tool_latency = tool_latency
+        self.sample_interval = sample_interval
+
+        self._queue = queue.Queue()
+        self._results = []
+        self._results_lock = threading.Lock()
+        self._queue_depth = []
+        self._waiting = 0  # Requests queued but not yet picked up (excludes stop markers)
+        self._startups = queue.Queue()  # One entry per worker: None once ready, or why it failed
+        self._startup_errors = []
+
+    def run(self):
+        """Run the test and return the report dict."""
+        workers = [threading.Thread(target=self._worker, daemon=True) for _ in range(self.users)]
+        for worker in workers:
+            worker.start()
+
+        # Wait until every virtual user has its agent, and give up if none could create one
+        for _ in workers:
+            error = self._startups.get()
+            if error is not None:
+                self._startup_errors.append(error)
+        if len(self._startup_errors) == len(workers):
+            raise RuntimeError(f"No virtual user could start: {self._startup_errors[0]}")
+
+        start = time.time()
+        sampler_stop = threading.Event()
+        sampler = threading.Thread(target=self._sample_queue, args=(start, sampler_stop), daemon=True)
+        sampler.start()
+
+        # Poisson arrivals at the configured rate
+        next_arrival = start
+        while True:
+            next_arrival += random.expovariate(self.rate)
+            if next_arrival - start > self.duration:
+                break
+            time.sleep(max(0, next_arrival - time.time()))
+            with self._results_lock:
+                self._waiting += 1
+            self._queue.put((time.time(), random.choice(self.queries)))
+
+        # Let the queue drain, then stop the workers
+        for _ in workers:
+            self._queue.put(None)
+        for worker in workers:
+            worker.join()
+        sampler_stop.set()
+        sampler.join()
+
+        return self._report(time.time() - start)
+
+    def _make_runner(self):
+        """Return a callable that answers one query, either locally or via the endpoint."""
+        if self.endpoint:
+            session = requests.Session()
+
+            def run_remote(query):
+                response = session.post(self.endpoint, json={"query": query}, timeout=120)
+                response.raise_for_status()
+                return response.text
+            return run_remote
+
+        model = MockModel(latency=self.llm_latency) if self.mock else None
+        agent = create_weather_enhanced_agent(model=model, verbosity_level=LogLevel.OFF)
+        if self.mock:
+            install_mock_backends(agent, latency=self.tool_latency)
+        return agent.run
+
+    def _worker(self):
+        """A virtual user: one agent, serving queued requests one at a time."""
+        try:
+            run = self._make_runner()
+        except Exception as e:
+            self._startups.put(f"Worker failed to start: {type(e).__name__}: {e}")
+            return
+        self._startups.put(None)
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            arrived, query = item
+            with self._results_lock:
+                self._waiting -= 1
+
+            started = time.time()
+            error = None
+            try:
+                result = run(query)
+                if isinstance(result, str) and result.startswith(("Error", "Unexpected error")):
+                    error = result
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            finished = time.time()
+
+            with self._results_lock:
+                self._results.append({
+                    "query": query,
+                    "wait_ms": (started - arrived) * 1000,
+                    "latency_ms": (finished - arrived) * 1000,
+                    "service_ms": (finished - started) * 1000,
+                    "error": error,
+                })
+
+    def _sample_queue(self, start, stop):
+        """Record the number of requests waiting for a virtual user."""
+        while not stop.wait(self.sample_interval):
+            self._queue_depth.append((round(time.time() - start, 1), self._waiting))
+
+    def _report(self, elapsed):
+        """Summarize the collected results."""
+        results = self._results
+        ok = [r for r in results if r["error"] is None]
+        latencies = sorted(r["latency_ms"] for r in ok)
+
+        histogram = []
+        lower = -math.inf
+        for upper in HISTOGRAM_BUCKETS:
+            count = sum(1 for value in latencies if lower < value <= upper)
+            histogram.append({"le_ms": upper, "count": count})
+            lower = upper
+
+        errors = {}
+        for error in self._startup_errors:
+            errors[error[:80]] = errors.get(error[:80], 0) + 1
+        for r in results:
+            if r["error"] is not None:
+                errors[r["error"][:80]] = errors.get(r["error"][:80], 0) + 1
+
+        return {
+            "users": self.users,
+            "arrival_rate": self.rate,
+            "elapsed_s": round(elapsed, 2),
+            "requests": len(results),
+            "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(1 - len(ok) / len(results), 4) if results else 0.0,
+            "latency_ms": {
+                "p50": percentile(latencies, 50),
+                "p90": percentile(latencies, 90),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "max": round(latencies[-1], 1) if latencies else None,
+            },
+            "mean_wait_ms": round(sum(r["wait_ms"] for r in results) / len(results), 1) if results else None,
+            "histogram": histogram,
+            "queue_depth": self._queue_depth,
+            "errors": errors,
+        }
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return round(sorted_values[rank], 1)
+
+
+def print_report(report, slo_p95=None):
+    """Print a human-readable report. Returns False if the p95 SLO was missed."""
+    latency = report["latency_ms"]
+    print("\n📊 Load Test Report")
+    print("=" * 60)
+    print(f"👥 Virtual users:  {report['users']}")
+    print(f"📥 Arrival rate:   {report['arrival_rate']} req/s")
+    print(f"⏱️ Elapsed:        {report['elapsed_s']} s")
+    print(f"✅ Requests:       {report['requests']} ({report['throughput_rps']} req/s completed)")
+    print(f"❌ Error rate:     {report['error_rate']:.2%}")
+    print(f"⌛ Mean queue wait: {report['mean_wait_ms']} ms")
+    print(f"📈 Latency (ms):   p50={latency['p50']} p90={latency['p90']} "
+          f"p95={latency['p95']} p99={latency['p99']} max={latency['max']}")
+
+    print("\n📊 Latency histogram")
+    print("-" * 60)
+    largest = max([bucket["count"] for bucket in report["histogram"]] + [1])
+    for bucket in report["histogram"]:
+        label = "inf" if bucket["le_ms"] == math.inf else f"{bucket['le_ms']}"
+        bar = "#" * round(40 * bucket["count"] / largest)
+        print(f"  <= {label:>6} ms | {bar} {bucket['count']}")
+
+    print("\n📦 Queue depth over time")
+    print("-" * 60)
+    for second, depth in report["queue_depth"]:
+        print(f"  t={second:>6}s  {depth:>4} {'#' * min(depth, 50)}")
+
+    if report["errors"]:
+        print("\n❌ Errors")
+        print("-" * 60)
+        for message, count in report["errors"].items():
+            print(f"  {count} x {message}")
+
+    if slo_p95 is None:
+        return True
+    met = latency["p95"] is not None and latency["p95"] <= slo_p95
+    print(f"\n🎯 SLO p95 <= {slo_p95} ms: {'MET' if met else 'MISSED'}")
+    return met
+
+
+def main():
+    """Parse command line arguments and run the load test."""
+    parser = argparse.ArgumentParser(description="Load test the weather enhanced agent.")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users (default: 10)")
+    parser.add_argument("--rate", type=float, default=5.0, help="Request arrival rate per second (default: 5)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load for (default: 30)")
+    parser.add_argument("--real", action="store_true", help="Use Ollama and the real tool backends instead of mocks")
+    parser.add_argument("--endpoint", help="POST {\"query\": ...} to this URL instead of running agents locally")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Mean mock LLM latency in seconds")
+    parser.add_argument("--tool-latency", type=float, default=0.1, help="Mean mock tool backend latency in seconds")
+    parser.add_argument("--slo-p95", type=float, help="Fail if p95 latency in ms is above this")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    print(f"🚀 Load testing with {args.users} users at {args.rate} req/s for {args.duration}s "
+          f"({'endpoint' if args.endpoint else 'real backends' if args.real else 'mock backends'})")
+
+    try:
+        report = LoadTest(
+            users=args.users,
+            rate=args.rate,
+            duration=args.duration,
+            endpoint=args.endpoint,
+            mock=not args.real,
+            llm_latency=args.llm_latency,
+            tool_latency=args.tool_latency,
+        ).run()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+
+    met = print_report(report, args.slo_p95)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\n💾 Report written to {args.json_path}")
+
+    raise SystemExit(0 if met else 1)
+
+
+if __name__ == "__main__":
+    main()
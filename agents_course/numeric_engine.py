@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Numeric engine for the math tools.
+Numbers are parsed from strings so no precision is lost on the way in, then added
+in one of three modes: "float" (fast, binary floating point), "decimal" (decimal
+arithmetic rounded to a configurable precision) or "exact" (no rounding at all).
+"""
+
+import math
+import os
+import re
+from decimal import Decimal, Inexact, InvalidOperation, MAX_EMAX, MAX_PREC, MIN_EMIN, Context
+from fractions import Fraction
+
+
+MODES = ("float", "decimal", "exact")
+
+# Inputs come from the LLM, so refuse numbers that would take huge amounts of memory to
+# write out (Python also refuses to convert int strings much longer than this)
+MAX_DIGITS = 4000
+
+INTEGER_PATTERN = re.compile(r"[+-]?\d+")
+
+# A context that never rounds: any inexact result raises instead
+EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN, traps=[Inexact, InvalidOperation])
+
+
+def terminating_places(denominator):
+    """Number of decimal places needed to write 1/denominator exactly, or None if it repeats."""
+    twos = fives = 0
+    while denominator % 2 == 0:
+        denominator //= 2
+        twos += 1
+    while denominator % 5 == 0:
+        denominator //= 5
+        fives += 1
+    return max(twos, fives) if denominator == 1 else None
+
+
+class NumericEngine:
+    """Parses, adds and formats numbers in the selected mode.
+
+    The mode and decimal precision default to the AGENT_NUMERIC_MODE and
+    AGENT_DECIMAL_PRECISION environment variables ("decimal" and 28 if unset).
+    """
+
+    def __init__(self, mode=None, precision=None):
+        self.mode = mode or os.getenv("AGENT_NUMERIC_MODE", "decimal")
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown numeric mode '{self.mode}', expected one of {MODES}")
+
+        self.precision = int(precision or os.getenv("AGENT_DECIMAL_PRECISION", 28))
+        self.context = Context(prec=self.precision)
+
+    def parse(self, value):
+        """Convert a string, int or float to a number for the current mode.
+
+        Strings may be integers ("12"), decimals ("0.1", "1e-3") or fractions ("1/3").
+        Floats are read through their shortest repr, so 0.1 becomes exactly 0.1.
+        """
+        if isinstance(value, bool) or not isinstance(value, (str, int, float, Decimal, Fraction)):
+            raise ValueError(f"Not a number: {value!r}")
+
+        if isinstance(value, str) and len(value) > MAX_DIGITS:
+            raise ValueError(f"Number too long: {len(value)} characters (max {MAX_DIGITS})")
+        if isinstance(value, int) and value.bit_length() > MAX_DIGITS * 3:
+            raise ValueError(f"Number too large (max {MAX_DIGITS} digits)")
+
+        if self.mode == "float":
+            if isinstance(value, str) and "/" not in value:
+                # Same limits as the other modes, although 1e-50000000 would fit (as 0.0)
+                self._parse_decimal(value.strip(), value)
+            number = float(Fraction(value.strip())) if isinstance(value, str) and "/" in value else float(value)
+            if not math.isfinite(number):
+                raise ValueError(f"Not a finite number: {value!r}")
+            return number
+        if isinstance(value, int):
+            return value
+
+        if isinstance(value, Fraction):
+            number = value
+        else:
+            text = repr(value) if isinstance(value, float) else str(value).strip()
+            # Whole numbers are kept as ints so they are always added exactly
+            if INTEGER_PATTERN.fullmatch(text):
+                return int(text)
+            if "/" not in text:
+                return self._parse_decimal(text, value)
+            try:
+                number = Fraction(text)
+            except ZeroDivisionError:
+                raise ValueError(f"Division by zero in {value!r}")
+
+        # Kept exact even in decimal mode; add_many() rounds the total once
+        return number
+
+    def _parse_decimal(self, text, value):
+        """Parse a decimal string such as "0.1" or "1e-3", refusing huge exponents."""
+        try:
+            number = Decimal(text)
+        except InvalidOperation:
+            raise ValueError(f"Not a number: {value!r}")
+        if not number.is_finite():
+            raise ValueError(f"Not a finite number: {value!r}")
+        if number and abs(number.adjusted()) > MAX_DIGITS:
+            raise ValueError(f"Exponent too large in {value!r} (max {MAX_DIGITS} digits)")
+
+        # "1e3" or "2.50e2" are whole numbers too
+        if number == number.to_integral_value():
+            return int(number)
+        return number
+
+    def add(self, a, b):
+        """Add two numbers."""
+        return self.add_many([a, b])
+
+    def add_many(self, values):
+        """Add any number of values, rounding at most once at the end."""
+        numbers = [self.parse(value) for value in values]
+
+        if self.mode == "float":
+            # fsum tracks partial sums exactly, so long lists don't accumulate rounding error
+            return math.fsum(numbers)
+
+        # Plain integers are the common case and Python adds them exactly
+        if all(isinstance(number, int) for number in numbers):
+            return sum(numbers)
+
+        if any(isinstance(number, Fraction) for number in numbers):
+            total = sum((Fraction(number) for number in numbers), Fraction(0))
+            if self.mode == "decimal":
+                return self.context.divide(Decimal(total.numerator), Decimal(total.denominator))
+            return total
+
+        total = self._exact_sum(numbers)
+        if self.mode == "decimal":
+            return self.context.plus(total)
+        return total
+
+    def format(self, number):
+        """Render a result as a string without losing precision."""
+        if isinstance(number, int):
+            return str(number)
+        if isinstance(number, float):
+            return str(int(number)) if number.is_integer() and abs(number) < 1e16 else repr(number)
+        if isinstance(number, Fraction):
+            if number.denominator == 1:
+                return str(number.numerator)
+            places = terminating_places(number.denominator)
+            if places is None:
+                return f"{number.numerator}/{number.denominator}"
+            number = Decimal(number.numerator * 10 ** places // number.denominator).scaleb(-places)
+
+        # Drop trailing zeros but never switch to scientific notation
+        text = format(number, "f")
+        if "." in text:
+            text = text.rstrip("0").rstrip(".")
+        return "0" if text == "-0" else text
+
+    def _exact_sum(self, numbers):
+        """Sum ints and Decimals without rounding."""
+        total = Decimal(0)
+        for number in numbers:
+            total = EXACT_CONTEXT.add(total, Decimal(number))
+        return total
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Rate limiting helpers for tools that call quota-limited APIs.
+Provides a token bucket (optionally shared between processes through a state file)
+and a single-flight group that collapses identical in-flight requests into one call.
+"""
+
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, file sharing is disabled there
+    fcntl = None
+
+
+class TokenBucket:
+    """A blocking token bucket that keeps callers under a per-minute quota.
+
+    Over any 60 second window the bucket grants at most ``burst + rate * 60``
+    tokens, so ``rate`` is derived from the quota minus the burst size. This keeps
+    throughput at the quota ceiling without ever crossing it.
+
+    If ``state_path`` is given, the bucket state lives in that file and is guarded
+    by an exclusive lock, so every process pointing at the same file shares one quota.
+    """
+
+    def __init__(self, calls_per_minute=60, burst=1, state_path=None):
+        if calls_per_minute <= burst:
+            raise ValueError("calls_per_minute must be greater than burst")
+
+        self.capacity = float(burst)
+        self.rate = (calls_per_minute - burst) / 60.0  # tokens per second
+        self.state_path = state_path if fcntl is not None else None
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.time()
+        self._blocked_until = 0.0
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                wait = self._try_take()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def backoff(self, seconds):
+        """Stop handing out tokens for ``seconds`` (e.g. after an unexpected 429)."""
+        with self._lock:
+            self._update_state(lambda state: {
+                "tokens": 0.0,
+                "updated": state["updated"],
+                "blocked_until": max(state["blocked_until"], time.time() + seconds),
+            })
+
+    def _try_take(self):
+        """Take a token if possible. Returns 0 on success, otherwise seconds to wait."""
+        result = {}
+
+        def take(state):
+            now = time.time()
+            if now < state["blocked_until"]:
+                result["wait"] = state["blocked_until"] - now
+                return state
+
+            elapsed = max(0.0, now - state["updated"])
+            tokens = min(self.capacity, state["tokens"] + elapsed * self.rate)
+            if tokens >= 1.0:
+                tokens -= 1.0
+                result["wait"] = 0.0
+            else:
+                result["wait"] = (1.0 - tokens) / self.rate
+            return {"tokens": tokens, "updated": now, "blocked_until": state["blocked_until"]}
+
+        self._update_state(take)
+        return result["wait"]
+
+    def _update_state(self, update):
+        """Apply ``update`` to the bucket state, in memory or in the shared state file."""
+        if self.state_path is None:
+            state = update({
+                "tokens": self._tokens,
+                "updated": self._updated,
+                "blocked_until": self._blocked_until,
+            })
+            self._tokens = state["tokens"]
+            self._updated = state["updated"]
+            self._blocked_until = state["blocked_until"]
+            return
+
+        with open(self.state_path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read())
+                except ValueError:
+                    state = {"tokens": self.capacity, "updated": time.time(), "blocked_until": 0.0}
+                state = update(state)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into a single execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running wait for it and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """Run ``fn`` for ``key`` unless an identical call is already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+
+        if not leader:
+            call["done"].wait()
+        else:
+            try:
+                call["result"] = fn()
+            except BaseException as e:
+                call["error"] = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call["done"].set()
+
+        if call["error"] is not None:
+            raise call["error"]
+        return call["result"]
+
+
+_shared_buckets = {}
+_shared_buckets_lock = threading.Lock()
+
+
+def get_shared_bucket(name, calls_per_minute=60, burst=1, state_path=None):
+    """Return the process-wide bucket called ``name``, creating it on first use."""
+    with _shared_buckets_lock:
+        if name not in _shared_buckets:
+            _shared_buckets[name] = TokenBucket(calls_per_minute, burst, state_path)
+        return _shared_buckets[name]
+
+
+def bucket_from_env(name, prefix, default_calls_per_minute=60):
+    """Build a shared bucket configured from ``<prefix>_CALLS_PER_MINUTE``,
+    ``<prefix>_BURST`` and ``<prefix>_RATE_STATE`` environment variables."""
+    calls_per_minute = int(os.getenv(f"{prefix}_CALLS_PER_MINUTE", default_calls_per_minute))
+    burst = int(os.getenv(f"{prefix}_BURST", 1))
+    state_path = os.getenv(f"{prefix}_RATE_STATE") or None
+    return get_shared_bucket(name, calls_per_minute, burst, state_path)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Persistent store of tool invocations backed by SQLite in WAL mode.
+Every call is appended with its arguments, result, latency and timestamp by a
+background writer thread, so recording never blocks the agent. Stored results can
+warm-start caches after a restart and answer repeat calls without a network request.
+"""
+
+import atexit
+import functools
+import hashlib
+import inspect
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS invocations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tool TEXT NOT NULL,
+    args_hash TEXT NOT NULL,
+    args TEXT NOT NULL,
+    result TEXT,
+    ok INTEGER NOT NULL,
+    latency_ms REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_invocations_lookup ON invocations (tool, args_hash, created_at);
+CREATE INDEX IF NOT EXISTS idx_invocations_time ON invocations (created_at);
+"""
+
+# Tools in this project report failures as strings with these prefixes
+ERROR_PREFIXES = ("Error", "Unexpected error")
+
+
+def hash_args(args):
+    """Return a stable hash for a dict of tool arguments."""
+    encoded = json.dumps(args, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def is_error_result(result):
+    """Check whether a tool result is one of the project's error strings."""
+    return isinstance(result, str) and result.startswith(ERROR_PREFIXES)
+
+
+class ResultStore:
+    """Append-only log of tool invocations with fast lookup by tool and arguments."""
+
+    def __init__(self, path="tool_results.db", batch_size=100, flush_interval=0.5, cache_size=1024):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.cache_size = cache_size
+
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        # Latest successful result per (tool, args_hash), least recently used first. Only
+        # tools that are replayed (passed to lookup() or warm_start()) are cached.
+        self._cache = OrderedDict()
+        self._cached_tools = set()
+        self._cache_lock = threading.Lock()
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+        self._writer = threading.Thread(target=self._write_loop, name="result-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def record(self, tool, args, result, latency):
+        """Queue an invocation for writing. Returns immediately."""
+        now = time.time()
+        args_hash = hash_args(args)
+        ok = not is_error_result(result)
+
+        if ok:
+            with self._cache_lock:
+                if tool in self._cached_tools:
+                    self._cache_put((tool, args_hash), result, now)
+
+        self._queue.put((
+            tool,
+            args_hash,
+            json.dumps(args, sort_keys=True, default=str),
+            json.dumps(result, default=str),
+            int(ok),
+            latency * 1000,
+            now,
+        ))
+
+    def lookup(self, tool, args, max_age=None):
+        """Return the latest successful result for these arguments, or None."""
+        args_hash = hash_args(args)
+        oldest = time.time() - max_age if max_age is not None else 0
+
+        with self._cache_lock:
+            self._cached_tools.add(tool)
+            cached = self._cache.get((tool, args_hash))
+            if cached is not None:
+                if cached[1] >= oldest:
+                    self._cache.move_to_end((tool, args_hash))
+                    return cached[0]
+                # Too old for this caller, and newer results would have replaced it
+                del self._cache[(tool, args_hash)]
+
+        row = self._connection().execute(
+            "SELECT result, created_at FROM invocations "
+            "WHERE tool = ? AND args_hash = ? AND ok = 1 AND created_at >= ? "
+            "ORDER BY created_at DESC LIMIT 1",
+            (tool, args_hash, oldest),
+        ).fetchone()
+        if row is None:
+            return None
+
+        result = json.loads(row[0])
+        with self._cache_lock:
+            self._cache_put((tool, args_hash), result, row[1])
+        return result
+
+    def history(self, tool=None, since=None, limit=100):
+        """Return recent invocations, newest first, as dicts."""
+        query = "SELECT tool, args, result, ok, latency_ms, created_at FROM invocations WHERE created_at >= ?"
+        params = [since or 0]
+        if tool is not None:
+            query += " AND tool = ?"
+            params.append(tool)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+
+        return [
+            {
+                "tool": row[0],
+                "args": json.loads(row[1]),
+                "result": json.loads(row[2]),
+                "ok": bool(row[3]),
+                "latency_ms": row[4],
+                "created_at": row[5],
+            }
+            for row in self._connection().execute(query, params)
+        ]
+
+    def warm_start(self, tool, max_age=None):
+        """Load the latest successful result for every argument set of a tool into memory."""
+        oldest = time.time() - max_age if max_age is not None else 0
+        rows = self._connection().execute(
+            "SELECT args_hash, result, MAX(created_at) FROM invocations "
+            "WHERE tool = ? AND ok = 1 AND created_at >= ? GROUP BY args_hash "
+            "ORDER BY MAX(created_at) DESC LIMIT ?",
+            (tool, oldest, self.cache_size),
+        ).fetchall()
+
+        # Oldest first, so the newest results are the last to be evicted
+        with self._cache_lock:
+            self._cached_tools.add(tool)
+            for args_hash, result, created_at in reversed(rows):
+                self._cache_put((tool, args_hash), json.loads(result), created_at)
+        return len(rows)
+
+    def flush(self):
+        """Block until every queued invocation has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending writes and stop the writer thread."""
+        # The atexit hook would otherwise keep this store alive for the life of the process
+        atexit.unregister(self.close)
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _cache_put(self, key, result, created_at):
+        """Cache a result, evicting the least recently used entries. Call with the cache lock held."""
+        self._cache[key] = (result, created_at)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _connection(self):
+        """SQLite connections can't be shared between threads, so keep one per thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _write_loop(self):
+        """Drain the queue in batches, one transaction per batch."""
+        conn = self._connection()
+        running = True
+
+        while running:
+            batch = [self._queue.get()]
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.time())))
+                except queue.Empty:
+                    break
+
+            rows = [item for item in batch if item is not None]
+            running = len(rows) == len(batch)
+            if rows:
+                try:
+                    with conn:
+                        conn.executemany(
+                            "INSERT INTO invocations "
+                            "(tool, args_hash, args, result, ok, latency_ms, created_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            rows,
+                        )
+                except sqlite3.Error as e:
+                    print(f"❌ Error writing tool results: {e}")
+
+            for _ in batch:
+                self._queue.task_done()
+
+
+def recorded(forward):
+    """Decorator for ``Tool.forward`` that records each call in ``self.result_store``.
+
+    Does nothing when the tool has no store attached.
+    """
+    signature = inspect.signature(forward)
+
+    @functools.wraps(forward)
+    def wrapper(self, *args, **kwargs):
+        store = getattr(self, "result_store", None)
+        if store is None:
+            return forward(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        call_args = {key: value for key, value in bound.arguments.items() if key != "self"}
+
+        start = time.perf_counter()
+        result = forward(self, *args, **kwargs)
+        store.record(self.name, call_args, result, time.perf_counter() - start)
+        return result
+
+    return wrapper
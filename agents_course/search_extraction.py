@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Compact extraction of DuckDuckGo Instant Answer results.
+Snippets are pulled from the response lazily, ranked against the query,
+de-duplicated and cut to a token budget so tool outputs stay small in the prompt.
+"""
+
+import codecs
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+# Higher weight = shown first when relevance is equal
+SNIPPET_WEIGHTS = {
+    "Answer": 3.0,
+    "Summary": 2.0,
+    "Definition": 1.5,
+    "Result": 1.0,
+    "Related": 0.5,
+}
+
+MAX_RESPONSE_BYTES = 512 * 1024
+
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+def read_json_stream(chunks, max_bytes=MAX_RESPONSE_BYTES):
+    """Decode a JSON document from an iterable of byte chunks.
+
+    Chunks are decoded as they arrive and reading stops at ``max_bytes``,
+    so an oversized response is rejected without buffering all of it.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts = []
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if size > max_bytes:
+            raise ValueError(f"Search response larger than {max_bytes} bytes")
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b"", final=True))
+    return json.loads("".join(parts))
+
+
+def iter_snippets(data):
+    """Yield (kind, text) pairs from a DuckDuckGo response, in document order."""
+    if data.get("Answer"):
+        yield "Answer", str(data["Answer"])
+    if data.get("Abstract"):
+        yield "Summary", data["Abstract"]
+    if data.get("Definition"):
+        yield "Definition", data["Definition"]
+    for result in data.get("Results") or []:
+        if isinstance(result, dict) and result.get("Text"):
+            yield "Result", result["Text"]
+    for topic in data.get("RelatedTopics") or []:
+        if not isinstance(topic, dict):
+            continue
+        if topic.get("Text"):
+            yield "Related", topic["Text"]
+        # Disambiguation groups nest their topics one level down
+        for subtopic in topic.get("Topics") or []:
+            if isinstance(subtopic, dict) and subtopic.get("Text"):
+                yield "Related", subtopic["Text"]
+
+
+def _words(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def _contains(longer, shorter):
+    """Whether ``shorter`` appears in ``longer`` as whole words (both normalized)."""
+    return f" {shorter} " in f" {longer} "
+
+
+def rank_snippets(snippets, query):
+    """Drop duplicate snippets and sort the rest by relevance to the query.
+
+    A snippet whose words appear within another is a duplicate of it. Of the two,
+    the one with the higher weight is kept (the longer one if the weights are equal).
+    """
+    query_words = set(_words(query))
+    kept = []
+
+    for position, (kind, text) in enumerate(snippets):
+        text = " ".join(text.split())
+        normalized = " ".join(_words(text))
+        if not normalized:
+            continue
+
+        rank = (SNIPPET_WEIGHTS.get(kind, 0), len(normalized))
+        duplicates = [
+            entry for entry in kept
+            if _contains(entry[1], normalized) or _contains(normalized, entry[1])
+        ]
+        if any(entry[0] >= rank for entry in duplicates):
+            continue
+        kept = [entry for entry in kept if entry not in duplicates]
+        kept.append((rank, normalized, position, kind, text))
+
+    ranked = []
+    for (weight, _), normalized, position, kind, text in kept:
+        overlap = len(query_words.intersection(normalized.split())) / len(query_words) if query_words else 0
+        ranked.append((weight + overlap, -position, kind, text))
+
+    ranked.sort(reverse=True)
+    return [(kind, text) for _, _, kind, text in ranked]
+
+
+def truncate_to_budget(snippets, max_tokens):
+    """Keep snippets in order until the token budget is spent, cutting the last one short."""
+    lines = []
+    remaining = max_tokens
+
+    for kind, text in snippets:
+        line = f"{kind}: {text}"
+        cost = estimate_tokens(line)
+        if cost <= remaining:
+            lines.append(line)
+            remaining -= cost
+            continue
+
+        # Fit what we can of this snippet at a word boundary, then stop
+        cut = line[:remaining * 4].rsplit(" ", 1)[0]
+        if len(cut) > len(kind) + 2:
+            lines.append(cut + "…")
+        break
+
+    return lines
+
+
+class SearchExtractor:
+    """Turns DuckDuckGo responses into short, ranked answers, cached by query.
+
+    Cached answers are reused for ``ttl`` seconds (None keeps them until evicted).
+    """
+
+    def __init__(self, max_tokens=200, cache_size=256, ttl=24 * 60 * 60):
+        self.max_tokens = max_tokens
+        self.cache_size = cache_size
+        self.ttl = ttl
+        # query key -> (answer, time cached), least recently used first
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cached(self, query):
+        """Return the compact answer for a query seen within the TTL, or None."""
+        key = self._key(query)
+        with self._lock:
+            if key not in self._cache:
+                return None
+            text, cached_at = self._cache[key]
+            if self.ttl is not None and time.monotonic() - cached_at > self.ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return text
+
+    def extract(self, data, query):
+        """Build and cache the compact answer for a decoded response. Returns None if empty."""
+        lines = truncate_to_budget(rank_snippets(iter_snippets(data), query), self.max_tokens)
+        if not lines:
+            return None
+
+        text = "\n".join(lines)
+        key = self._key(query)
+        with self._lock:
+            self._cache[key] = (text, time.monotonic())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return text
+
+    def _key(self, query):
+        return " ".join(query.lower().split())
@@ -5,28 +5,37 @@ This agent has a tool to add two numbers provided by the user.
 """
 
 from smolagents import Tool, ToolCallingAgent, LiteLLMModel
+from numeric_engine import NumericEngine
 
 
 class AddNumbersTool(Tool):
     """A simple tool to add two numbers."""
     
     name = "add_numbers"
-    description = "Adds two numbers together. Takes two numeric inputs and returns their sum."
+    description = "Adds two numbers together. Takes two numeric inputs and returns their sum as a string. Pass numbers as strings (e.g. '0.1') to keep full precision."
     inputs = {
         "a": {
-            "type": "number",
-            "description": "The first number to add"
+            "type": ["string", "number", "integer"],
+            "description": "The first number to add, e.g. '0.1', '12345678901234567890' or '1/3'"
         },
         "b": {
-            "type": "number", 
+            "type": ["string", "number", "integer"],
             "description": "The second number to add"
         }
     }
-    output_type = "number"
+    output_type = "string"
     
-    def forward(self, a: float, b: float) -> float:
+    def __init__(self, mode=None, precision=None, *args, **kwargs):
+        """Create the tool. ``mode`` is "float", "decimal" or "exact" (see numeric_engine)."""
+        super().__init__(*args, **kwargs)
+        self.engine = NumericEngine(mode, precision)
+    
+    def forward(self, a: str, b: str) -> str:
         """Add two numbers together."""
-        return a + b
+        try:
+            return self.engine.format(self.engine.add(a, b))
+        except (ValueError, ArithmeticError) as e:
+            return f"Error adding numbers: {str(e)}"
 
 
 def create_math_agent():
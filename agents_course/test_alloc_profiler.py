@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the allocation profiler
+"""
+
+import json
+import os
+import tempfile
+from unittest import mock
+
+from alloc_profiler import AllocationProfiler, module_group
+from search_extraction import read_json_stream
+
+
+leaked = []
+
+
+def leaky_run(query):
+    """Pretend agent run that keeps a formatted string alive after returning."""
+    leaked.append(f"Result for {query}: " + "x" * 10000)
+    return "done"
+
+
+def test_profile_runs():
+    """Per-run deltas are recorded and periodic reports are written."""
+
+    print("🧠 Testing Allocation Profiler")
+    print("=" * 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = os.path.join(tmp, "memory.txt")
+        profiler = AllocationProfiler(snapshot_every=3, report_path=report_path).start()
+        try:
+            for i in range(6):
+                assert profiler.profile_run(leaky_run, f"query {i}") == "done"
+            profiler.dump()
+        finally:
+            profiler.stop()
+
+        with open(report_path) as f:
+            report = f.read()
+
+    print(report)
+    # Only the runs shown in the next report are kept
+    assert [number for number, _, _, _ in profiler.runs] == [4, 5, 6]
+    assert all(retained >= 10000 for _, _, retained, _ in profiler.runs)
+    assert report.count("Allocation growth over the last 3 runs") == 2
+    assert "Allocation growth since start" in report
+    assert "test_alloc_profiler.py" in report
+
+
+def test_attribution_through_stdlib():
+    """Memory allocated by the json module for search_extraction is credited to search_extraction."""
+
+    print("\n🔗 Testing Attribution Through the Standard Library")
+    print("=" * 40)
+
+    payload = json.dumps({"RelatedTopics": [{"Text": f"Topic number {i}"} for i in range(10000)]}).encode("utf-8")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = os.path.join(tmp, "memory.txt")
+        profiler = AllocationProfiler(report_path=report_path).start()
+        try:
+            kept = profiler.profile_run(read_json_stream, [payload])
+            profiler.dump()
+        finally:
+            profiler.stop()
+
+        with open(report_path) as f:
+            report = f.read()
+
+    by_module = report.split("By module:")[1].split("Top")[0]
+    print(by_module)
+    assert len(kept["RelatedTopics"]) == 10000
+    assert by_module.split()[0] == "search_extraction"
+
+
+def test_module_groups():
+    """Source files are grouped by the package they belong to."""
+
+    print("\n📦 Testing Module Groups")
+    print("=" * 40)
+
+    assert module_group("/app/agents_course/weather_enhanced_agent.py") == "weather_enhanced_agent"
+    assert module_group("/app/agents_course/enhanced_agent.py") == "enhanced_agent"
+    assert module_group("/venv/lib/python3.11/site-packages/smolagents/agents.py") == "smolagents"
+    assert module_group("/venv/lib/python3.11/site-packages/litellm/main.py") == "litellm"
+    assert module_group("/venv/lib/python3.11/site-packages/requests/models.py") == "requests"
+    assert module_group("/usr/lib/python3.11/json/decoder.py") == "other"
+    assert module_group("weather_enhanced_agent.py") == "weather_enhanced_agent"
+    # Only whole directory or module names count
+    assert module_group("/home/u/requests-demo/agents_course/weather_enhanced_agent.py") == "weather_enhanced_agent"
+    assert module_group("/home/u/requests-demo/agents_course/load_test.py") == "other"
+    assert module_group("/home/u/openai_notes/main.py") == "other"
+    print("✅ Module groups resolved")
+
+
+def test_from_env():
+    """AGENT_MEMPROFILE turns profiling on, off, or is rejected."""
+
+    print("\n🌱 Testing AGENT_MEMPROFILE")
+    print("=" * 40)
+
+    with mock.patch.dict(os.environ, {"AGENT_MEMPROFILE": "5"}):
+        assert AllocationProfiler.from_env().snapshot_every == 5
+    for off in ("", "0"):
+        with mock.patch.dict(os.environ, {"AGENT_MEMPROFILE": off}):
+            assert AllocationProfiler.from_env() is None
+    for bad in ("yes", "-1", "2.5"):
+        with mock.patch.dict(os.environ, {"AGENT_MEMPROFILE": bad}):
+            try:
+                AllocationProfiler.from_env()
+            except ValueError as e:
+                print(f"✅ Rejected {bad!r}: {e}")
+            else:
+                raise AssertionError(f"AGENT_MEMPROFILE={bad!r} should be rejected")
+
+
+if __name__ == "__main__":
+    test_profile_runs()
+    test_attribution_through_stdlib()
+    test_module_groups()
+    test_from_env()
+    print("\n🎉 All tests completed!")
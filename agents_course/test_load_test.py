@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script for the load generator, using the mock LLM and tool backends
+"""
+
+from load_test import LoadTest, print_report
+
+
+def failing_runner():
+    """Stands in for LoadTest._make_runner() when the agent can't be created."""
+    raise ConnectionError("Ollama is not running")
+
+
+def test_mock_load():
+    """A short run against the mocks completes every request without errors."""
+
+    print("🚦 Testing Load Generator")
+    print("=" * 40)
+
+    report = LoadTest(users=4, rate=10, duration=1.5, llm_latency=0.01, tool_latency=0.01,
+                      sample_interval=0.5).run()
+    print_report(report)
+
+    assert report["requests"] > 0
+    assert report["error_rate"] == 0
+    assert sum(bucket["count"] for bucket in report["histogram"]) == report["requests"]
+    assert report["queue_depth"][-1][1] == 0
+
+
+def test_worker_startup_failures():
+    """Workers that can't create an agent are reported, and the run aborts if none start."""
+
+    print("\n💥 Testing Worker Startup Failures")
+    print("=" * 40)
+
+    load_test = LoadTest(users=2, rate=10, duration=1.0, llm_latency=0.01, tool_latency=0.01)
+    make_runner = load_test._make_runner
+    attempts = []
+
+    def flaky_runner():
+        attempts.append(1)
+        if len(attempts) == 1:
+            failing_runner()
+        return make_runner()
+
+    load_test._make_runner = flaky_runner
+    report = load_test.run()
+    print(f"✅ Errors: {report['errors']}")
+    assert report["requests"] > 0
+    assert report["errors"] == {"Worker failed to start: ConnectionError: Ollama is not running": 1}
+
+    load_test = LoadTest(users=2, rate=10, duration=0.5)
+    load_test._make_runner = failing_runner
+    try:
+        load_test.run()
+    except RuntimeError as e:
+        print(f"✅ Aborted: {e}")
+        assert "Ollama is not running" in str(e)
+    else:
+        raise AssertionError("run() should fail when no worker starts")
+
+
+if __name__ == "__main__":
+    test_mock_load()
+    test_worker_startup_failures()
+    print("\n🎉 All tests completed!")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for the numeric engine behind the math tools
+"""
+
+from numeric_engine import NumericEngine
+from weather_enhanced_agent import AddNumbersTool, SumNumbersTool
+
+
+def test_modes():
+    """Each mode adds 0.1 + 0.2 and big integers as expected."""
+
+    print("🔢 Testing Numeric Modes")
+    print("=" * 40)
+
+    big = "123456789012345678901234567890"
+    expected = {
+        "float": ("0.30000000000000004", "1.2345678901234568e+29"),
+        "decimal": ("0.3", "123456789012345678901234567891"),
+        "exact": ("0.3", "123456789012345678901234567891"),
+    }
+
+    for mode, (small_sum, big_sum) in expected.items():
+        engine = NumericEngine(mode, precision=40)
+        small = engine.format(engine.add("0.1", "0.2"))
+        large = engine.format(engine.add(big, "1"))
+        print(f"✅ {mode}: 0.1 + 0.2 = {small}, {big} + 1 = {large}")
+        assert small == small_sum
+        assert large == big_sum
+
+
+def test_default_precision():
+    """At the default precision, whole numbers stay exact however they are passed in."""
+
+    print("\n💯 Testing Default Precision")
+    print("=" * 40)
+
+    engine = NumericEngine("decimal")
+    big = "123456789012345678901234567890"
+
+    assert engine.format(engine.add(big, "1")) == "123456789012345678901234567891"
+    assert engine.format(engine.add(int(big), "1")) == "123456789012345678901234567891"
+    assert engine.format(engine.add(big, 1)) == "123456789012345678901234567891"
+    assert engine.format(engine.add("1e30", "1")) == "1000000000000000000000000000001"
+    assert engine.format(engine.add("0.1", "0.2")) == "0.3"
+    print("✅ Big integers are added exactly")
+
+
+def test_rejects_bad_input():
+    """Non-finite and absurdly large numbers are refused in every mode."""
+
+    print("\n🚫 Testing Bad Input")
+    print("=" * 40)
+
+    for mode in ("float", "decimal", "exact"):
+        engine = NumericEngine(mode)
+        for value in ("inf", "nan", float("inf"), "1e50000000", "1e-50000000", "9" * 5000):
+            try:
+                engine.add(value, "1")
+            except ValueError:
+                continue
+            raise AssertionError(f"{mode} mode accepted {str(value)[:20]!r}")
+    print("✅ Bad input rejected")
+
+
+def test_precision_and_fractions():
+    """Decimal mode rounds to its precision; exact mode keeps fractions."""
+
+    print("\n🎯 Testing Precision and Fractions")
+    print("=" * 40)
+
+    decimal_engine = NumericEngine("decimal", precision=5)
+    exact_engine = NumericEngine("exact")
+
+    assert decimal_engine.format(decimal_engine.add("1/3", "0")) == "0.33333"
+    # Fractions are summed exactly and rounded once, not once per operand
+    assert decimal_engine.format(decimal_engine.add_many(["1/3"] * 3)) == "1"
+    assert NumericEngine("decimal").format(NumericEngine("decimal").add_many(["1/3"] * 3)) == "1"
+    assert decimal_engine.format(decimal_engine.add_many(["1/3", "0.1"])) == "0.43333"
+    assert exact_engine.format(exact_engine.add("1/3", "1/6")) == "0.5"
+    assert exact_engine.format(exact_engine.add("1/3", "1")) == "4/3"
+    assert exact_engine.format(exact_engine.add(0.1, 0.2)) == "0.3"
+    print("✅ Precision and fractions handled")
+
+
+def test_tools():
+    """The tools return strings and report bad input as an error message."""
+
+    print("\n🧮 Testing Math Tools")
+    print("=" * 40)
+
+    add_tool = AddNumbersTool(mode="exact")
+    sum_tool = SumNumbersTool(mode="decimal")
+
+    prices = ["19.99", "0.01"] * 5000
+    total = sum_tool(numbers=prices)
+    print(f"✅ add_numbers('0.1', '0.2') = {add_tool(a='0.1', b='0.2')}")
+    print(f"✅ sum_numbers(10000 prices) = {total}")
+
+    assert add_tool(a="0.1", b="0.2") == "0.3"
+    assert add_tool(a=2, b=3) == "5"
+    assert total == "100000"
+    assert add_tool(a="ten", b="1").startswith("Error adding numbers")
+
+
+if __name__ == "__main__":
+    test_modes()
+    test_default_precision()
+    test_rejects_bad_input()
+    test_precision_and_fractions()
+    test_tools()
+    print("\n🎉 All tests completed!")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test script for the rate limiter used by the weather tool
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+
+import requests
+
+import weather_enhanced_agent
+from rate_limiter import SingleFlight, TokenBucket
+from weather_enhanced_agent import WeatherTool
+
+
+def test_token_bucket():
+    """Burst tokens are immediate, the rest are paced at the refill rate."""
+
+    print("🪣 Testing Token Bucket")
+    print("=" * 40)
+
+    bucket = TokenBucket(calls_per_minute=600, burst=2)
+
+    start = time.time()
+    for _ in range(5):
+        bucket.acquire()
+    elapsed = time.time() - start
+
+    print(f"✅ 5 tokens took {elapsed:.2f}s")
+    # 2 burst tokens, then 3 more at ~10 per second
+    assert 0.25 <= elapsed < 1.0
+
+
+def test_shared_state_file():
+    """Two buckets pointing at the same file share one quota."""
+
+    print("\n📁 Testing Shared State File")
+    print("=" * 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = os.path.join(tmp, "bucket.json")
+        first = TokenBucket(calls_per_minute=600, burst=2, state_path=state_path)
+        second = TokenBucket(calls_per_minute=600, burst=2, state_path=state_path)
+
+        start = time.time()
+        for bucket in (first, second, first, second):
+            bucket.acquire()
+        elapsed = time.time() - start
+
+    print(f"✅ 4 tokens across two buckets took {elapsed:.2f}s")
+    assert elapsed >= 0.15
+
+
+def test_single_flight():
+    """Concurrent calls for the same key run the function once."""
+
+    print("\n✈️ Testing Single Flight")
+    print("=" * 40)
+
+    flights = SingleFlight()
+    calls = []
+    results = []
+
+    def slow_lookup():
+        calls.append(1)
+        time.sleep(0.2)
+        return "sunny"
+
+    threads = [
+        threading.Thread(target=lambda: results.append(flights.do("london", slow_lookup)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"✅ {len(results)} callers, {len(calls)} lookup(s)")
+    assert len(calls) == 1
+    assert results == ["sunny"] * 5
+
+
+def fake_response(status_code, body=None, headers=None):
+    """Build a requests.Response without touching the network."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = json.dumps(body or {}).encode("utf-8")
+    response.url = "https://api.openweathermap.org/data/2.5/weather"
+    return response
+
+
+WEATHER_BODY = {
+    "main": {"temp": 18.5, "feels_like": 17.9, "humidity": 60, "pressure": 1012},
+    "weather": [{"description": "light rain"}],
+    "wind": {"speed": 4.2},
+}
+
+
+def test_weather_backoff_on_429():
+    """A 429 from OpenWeatherMap backs the shared bucket off and retries once."""
+
+    print("\n🚦 Testing 429 Backoff")
+    print("=" * 40)
+
+    bucket = TokenBucket(calls_per_minute=6000, burst=10)
+    too_many = fake_response(429, {"message": "rate limited"}, {"Retry-After": "0"})
+    weather_tool = WeatherTool()
+
+    with mock.patch.dict(os.environ, {"OPENWEATHER_API_KEY": "test_key"}), \
+            mock.patch.object(weather_enhanced_agent, "bucket_from_env", return_value=bucket), \
+            mock.patch.object(bucket, "backoff", wraps=bucket.backoff) as backoff:
+        # Rate limited once, then answered
+        with mock.patch.object(weather_enhanced_agent.requests, "get",
+                               side_effect=[too_many, fake_response(200, WEATHER_BODY)]) as get:
+            result = weather_tool(city="Paris")
+        print(f"✅ Retried after one 429:\n{result}")
+        assert get.call_count == 2
+        backoff.assert_called_once_with(0.0)
+        assert "Temperature: 18.5°C" in result
+        assert "Light Rain" in result
+
+        # Rate limited twice: give up with the tool's error string
+        backoff.reset_mock()
+        with mock.patch.object(weather_enhanced_agent.requests, "get",
+                               side_effect=[too_many, too_many]) as get:
+            result = weather_tool(city="Lyon")
+        print(f"✅ Gave up after two 429s: {result}")
+        assert get.call_count == 2
+        assert backoff.call_count == 1
+        assert result.startswith("Error getting weather for Lyon")
+
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_shared_state_file()
+    test_single_flight()
+    test_weather_backoff_on_429()
+    print("\n🎉 All tests completed!")
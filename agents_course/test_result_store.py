@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent tool result store
+"""
+
+import os
+import tempfile
+import time
+
+from result_store import ResultStore
+from weather_enhanced_agent import AddNumbersTool, WebSearchTool
+
+
+def test_record_and_lookup():
+    """Recorded calls survive a restart and can warm-start a new store."""
+
+    print("🗄️ Testing Result Store")
+    print("=" * 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.db")
+
+        store = ResultStore(path)
+        add_tool = AddNumbersTool()
+        add_tool.result_store = store
+        assert add_tool(a="2", b="3") == "5"
+        store.record("web_search", {"query": "python"}, "Summary: A language", 0.25)
+        store.record("web_search", {"query": "broken"}, "Error performing web search: timeout", 0.1)
+        store.close()
+
+        # A fresh store on the same file sees everything that was written
+        store = ResultStore(path)
+        history = store.history()
+        print(f"✅ {len(history)} invocations stored")
+        assert len(history) == 3
+        assert store.history(tool="add_numbers")[0]["args"] == {"a": "2", "b": "3"}
+
+        assert store.warm_start("web_search") == 1
+        assert store.lookup("web_search", {"query": "python"}) == "Summary: A language"
+        assert store.lookup("web_search", {"query": "broken"}) is None
+        store.close()
+
+
+def test_cache_is_bounded():
+    """Only replayed tools are cached, up to cache_size entries, and expired entries are dropped."""
+
+    print("\n📏 Testing Cache Bounds")
+    print("=" * 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(os.path.join(tmp, "results.db"), cache_size=10)
+
+        for i in range(1000):
+            store.record("add_numbers", {"a": str(i), "b": "1"}, str(i + 1), 0.001)
+        assert len(store._cache) == 0
+
+        store.warm_start("web_search")
+        for i in range(100):
+            store.record("web_search", {"query": f"query {i}"}, f"Summary: {i}", 0.1)
+        assert len(store._cache) == 10
+        assert store.lookup("web_search", {"query": "query 99"}) == "Summary: 99"
+
+        # An entry older than max_age is not served and is removed from memory
+        time.sleep(0.05)
+        assert store.lookup("web_search", {"query": "query 99"}, max_age=0.01) is None
+        assert len(store._cache) == 9
+        print("✅ Cache stays bounded")
+        store.close()
+
+
+def test_search_replay():
+    """Repeat searches are answered from the store without a network call."""
+
+    print("\n🔁 Testing Search Replay")
+    print("=" * 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(os.path.join(tmp, "results.db"))
+        # As in create_weather_enhanced_agent(), which warm-starts the tools that replay
+        store.warm_start("web_search")
+        store.record("web_search", {"query": "Albert Einstein"}, "Summary: A physicist", 0.3)
+
+        search_tool = WebSearchTool()
+        search_tool.result_store = store
+        result = search_tool(query="Albert Einstein")
+        print(f"✅ Replayed: {result}")
+        assert result == "Summary: A physicist"
+
+        # Replayed results are not recorded again, so they still expire
+        store.flush()
+        assert len(store.history(tool="web_search")) == 1
+        store.close()
+
+
+if __name__ == "__main__":
+    test_record_and_lookup()
+    test_cache_is_bounded()
+    test_search_replay()
+    print("\n🎉 All tests completed!")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the compact web search extraction
+"""
+
+import json
+import time
+
+from search_extraction import SearchExtractor, estimate_tokens, rank_snippets, read_json_stream
+from weather_enhanced_agent import WebSearchTool
+
+
+SAMPLE_RESPONSE = {
+    "Abstract": "Albert Einstein was a German-born theoretical physicist who developed the theory of relativity.",
+    "Answer": "",
+    "RelatedTopics": [
+        {"Text": "Albert Einstein was a German-born theoretical physicist"},
+        {"Text": "Theory of relativity - Two interrelated physics theories by Albert Einstein."},
+        {"Name": "People", "Topics": [
+            {"Text": "Hans Albert Einstein - Swiss-American engineer and son of Albert Einstein."},
+            {"Text": "Mileva Marić - Serbian physicist and mathematician."},
+        ]},
+    ],
+}
+
+
+def test_extraction():
+    """Snippets are ranked, de-duplicated and kept within the token budget."""
+
+    print("🔎 Testing Search Extraction")
+    print("=" * 40)
+
+    chunks = [json.dumps(SAMPLE_RESPONSE).encode("utf-8")[i:i + 50] for i in range(0, 2000, 50)]
+    data = read_json_stream(chunks)
+
+    result = SearchExtractor(max_tokens=60).extract(data, "Albert Einstein")
+    print(f"✅ Result ({estimate_tokens(result)} tokens):\n{result}")
+
+    lines = result.split("\n")
+    assert lines[0].startswith("Summary: Albert Einstein")
+    # The related topic repeating the abstract is dropped
+    assert not any(line == "Related: Albert Einstein was a German-born theoretical physicist" for line in lines)
+    assert estimate_tokens(result) <= 60 + len(lines)
+
+
+def test_deduplication():
+    """Only snippets repeated word for word are dropped, keeping the more important copy."""
+
+    print("\n🧹 Testing De-duplication")
+    print("=" * 40)
+
+    ranked = rank_snippets([
+        ("Summary", "Impressionism is an art movement that started in France."),
+        ("Related", "Start"),
+        ("Related", "France"),
+        ("Related", "an art movement"),
+    ], "art")
+    print(f"✅ Kept: {ranked}")
+    # A word that only occurs inside another word is not a duplicate
+    assert ("Related", "Start") in ranked
+    assert ("Related", "France") not in ranked
+    assert ("Related", "an art movement") not in ranked
+
+    # A more important snippet arriving later replaces the shorter one it contains
+    ranked = rank_snippets([
+        ("Related", "Albert Einstein was a physicist"),
+        ("Summary", "Albert Einstein was a physicist who developed relativity."),
+    ], "einstein")
+    assert ranked == [("Summary", "Albert Einstein was a physicist who developed relativity.")]
+
+    # ...but a lower-weighted snippet does not replace a higher-weighted one
+    ranked = rank_snippets([
+        ("Answer", "Albert Einstein"),
+        ("Related", "Albert Einstein - German-born physicist"),
+    ], "einstein")
+    assert ranked == [("Answer", "Albert Einstein")]
+
+
+def test_search_tool_cache():
+    """A repeat query is answered from the cache without fetching."""
+
+    print("\n💾 Testing Search Cache")
+    print("=" * 40)
+
+    fetches = []
+    search_tool = WebSearchTool(max_tokens=100)
+    search_tool._fetch_results = lambda query: fetches.append(query) or SAMPLE_RESPONSE
+
+    first = search_tool(query="Albert Einstein")
+    second = search_tool(query="albert  einstein")
+    print(f"✅ {len(fetches)} fetch(es) for 2 queries")
+    assert first == second
+    assert fetches == ["Albert Einstein"]
+
+    # Once the cached answer is older than replay_max_age the query is fetched again
+    search_tool.extractor.ttl = 0
+    time.sleep(0.01)
+    assert search_tool(query="Albert Einstein") == first
+    assert len(fetches) == 2
+    assert len(search_tool.extractor._cache) == 1
+
+
+if __name__ == "__main__":
+    test_extraction()
+    test_deduplication()
+    test_search_tool_cache()
+    print("\n🎉 All tests completed!")
@@ -6,30 +6,80 @@ This agent has tools to add numbers, perform web searches, and get real-time wea
 
 import requests
 import os
+import threading
 from datetime import datetime
 from smolagents import Tool, ToolCallingAgent, LiteLLMModel
+from alloc_profiler import AllocationProfiler
+from numeric_engine import NumericEngine
+from rate_limiter import SingleFlight, bucket_from_env
+from result_store import ResultStore, recorded
+from search_extraction import SearchExtractor, read_json_stream
+
+
+# Shared by every WeatherTool in the process so the OpenWeatherMap quota is respected
+# no matter how many agents are running. Set OPENWEATHER_RATE_STATE to a file path to
+# share the quota across processes as well.
+_weather_flights = SingleFlight()
 
 
 class AddNumbersTool(Tool):
     """A simple tool to add two numbers."""
     
     name = "add_numbers"
-    description = "Adds two numbers together. Takes two numeric inputs and returns their sum."
+    description = "Adds two numbers together. Takes two numeric inputs and returns their sum as a string. Pass numbers as strings (e.g. '0.1') to keep full precision."
     inputs = {
         "a": {
-            "type": "number",
-            "description": "The first number to add"
+            "type": ["string", "number", "integer"],
+            "description": "The first number to add, e.g. '0.1', '12345678901234567890' or '1/3'"
         },
         "b": {
-            "type": "number", 
+            "type": ["string", "number", "integer"],
             "description": "The second number to add"
         }
     }
-    output_type = "number"
+    output_type = "string"
+    result_store = None  # Set by create_weather_enhanced_agent() to record calls
+    
+    def __init__(self, mode=None, precision=None, *args, **kwargs):
+        """Create the tool. ``mode`` is "float", "decimal" or "exact" (see numeric_engine)."""
+        super().__init__(*args, **kwargs)
+        self.engine = NumericEngine(mode, precision)
     
-    def forward(self, a: float, b: float) -> float:
+    @recorded
+    def forward(self, a: str, b: str) -> str:
         """Add two numbers together."""
-        return a + b
+        try:
+            return self.engine.format(self.engine.add(a, b))
+        except (ValueError, ArithmeticError) as e:
+            return f"Error adding numbers: {str(e)}"
+
+
+class SumNumbersTool(Tool):
+    """A tool to add up a whole list of numbers in one call."""
+    
+    name = "sum_numbers"
+    description = "Adds up a list of numbers and returns the total as a string. Use this instead of add_numbers when there are more than two numbers. Pass numbers as strings (e.g. '0.1') to keep full precision."
+    inputs = {
+        "numbers": {
+            "type": "array",
+            "description": "The numbers to add up, e.g. ['19.99', '5.01', '1e3']"
+        }
+    }
+    output_type = "string"
+    result_store = None  # Set by create_weather_enhanced_agent() to record calls
+    
+    def __init__(self, mode=None, precision=None, *args, **kwargs):
+        """Create the tool. ``mode`` is "float", "decimal" or "exact" (see numeric_engine)."""
+        super().__init__(*args, **kwargs)
+        self.engine = NumericEngine(mode, precision)
+    
+    @recorded
+    def forward(self, numbers: list) -> str:
+        """Add up all the numbers, rounding at most once."""
+        try:
+            return self.engine.format(self.engine.add_many(numbers))
+        except (ValueError, ArithmeticError) as e:
+            return f"Error adding numbers: {str(e)}"
 
 
 class WeatherTool(Tool):
@@ -44,7 +94,9 @@ class WeatherTool(Tool):
         }
     }
     output_type = "string"
+    result_store = None  # Set by create_weather_enhanced_agent() to record calls
     
+    @recorded
     def forward(self, city: str) -> str:
         """Get current weather information for a city."""
         try:
@@ -56,18 +108,8 @@ class WeatherTool(Tool):
             if api_key == 'demo_key_for_testing':
                 return self._get_demo_weather(city)
             
-            # Make API call to OpenWeatherMap
-            url = "http://api.openweathermap.org/data/2.5/weather"
-            params = {
-                'q': city,
-                'appid': api_key,
-                'units': 'metric'  # Use Celsius
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            # Identical in-flight lookups for the same city share a single API call
+            data = _weather_flights.do(city.strip().lower(), lambda: self._fetch_weather(city, api_key))
             
             # Extract weather information
             weather_info = self._parse_weather_data(data, city)
@@ -78,6 +120,31 @@ class WeatherTool(Tool):
         except Exception as e:
             return f"Unexpected error getting weather for {city}: {str(e)}"
     
+    def _fetch_weather(self, city, api_key):
+        """Call OpenWeatherMap for a city, waiting for the shared rate limiter first."""
+        limiter = bucket_from_env("openweathermap", "OPENWEATHER")
+        
+        url = "http://api.openweathermap.org/data/2.5/weather"
+        params = {
+            'q': city,
+            'appid': api_key,
+            'units': 'metric'  # Use Celsius
+        }
+        
+        for attempt in range(2):
+            limiter.acquire()
+            response = requests.get(url, params=params, timeout=10)
+            
+            # Another client may be sharing the key; pause everyone and retry once
+            if response.status_code == 429 and attempt == 0:
+                retry_after = response.headers.get('Retry-After', '60')
+                limiter.backoff(float(retry_after) if retry_after.isdigit() else 60.0)
+                continue
+            break
+        
+        response.raise_for_status()
+        return response.json()
+    
     def _parse_weather_data(self, data, city):
         """Parse weather data from OpenWeatherMap API response."""
         try:
@@ -155,77 +222,118 @@ class WebSearchTool(Tool):
         }
     }
     output_type = "string"
+    result_store = None  # Set by create_weather_enhanced_agent() to record calls
+    replay_max_age = 24 * 60 * 60  # Reuse stored search results for up to a day
+    
+    def __init__(self, max_tokens=200, *args, **kwargs):
+        """Create the tool. ``max_tokens`` caps the size of each search result."""
+        super().__init__(*args, **kwargs)
+        # Answers cached in memory expire with the stored ones
+        self.extractor = SearchExtractor(max_tokens=max_tokens, ttl=self.replay_max_age)
     
     def forward(self, query: str) -> str:
         """Perform a web search and return relevant information."""
         try:
-            # Using DuckDuckGo Instant Answer API (no API key required)
-            url = "https://api.duckduckgo.com/"
-            params = {
-                'q': query,
-                'format': 'json',
-                'no_html': '1',
-                'skip_disambig': '1'
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Extract relevant information
-            result_parts = []
-            
-            # Add abstract if available
-            if data.get('Abstract'):
-                result_parts.append(f"Summary: {data['Abstract']}")
+            # Repeat queries are answered from the in-memory cache first
+            cached = self.extractor.cached(query)
+            if cached is not None:
+                return cached
             
-            # Add answer if available
-            if data.get('Answer'):
-                result_parts.append(f"Answer: {data['Answer']}")
+            # Then from the result store, without a network call
+            if self.result_store is not None:
+                stored = self.result_store.lookup(self.name, {'query': query}, max_age=self.replay_max_age)
+                if stored is not None:
+                    return stored
+        except Exception as e:
+            return f"Unexpected error during web search: {str(e)}"
+        
+        return self._search(query)
+    
+    # Only real searches are recorded, so replayed results still expire after replay_max_age
+    @recorded
+    def _search(self, query):
+        """Search the web and build the compact answer."""
+        try:
+            data = self._fetch_results(query)
             
-            # Add related topics if available
-            if data.get('RelatedTopics') and len(data['RelatedTopics']) > 0:
-                topics = data['RelatedTopics'][:3]  # Limit to first 3
-                topic_texts = []
-                for topic in topics:
-                    if isinstance(topic, dict) and topic.get('Text'):
-                        topic_texts.append(topic['Text'])
-                if topic_texts:
-                    result_parts.append(f"Related: {'; '.join(topic_texts)}")
+            # Rank, de-duplicate and trim the snippets to the token budget
+            result = self.extractor.extract(data, query)
             
             # If no specific results, provide a general response
-            if not result_parts:
-                result_parts.append(f"I searched for '{query}' but couldn't find specific information. You might want to try a more specific search term.")
+            if result is None:
+                result = f"I searched for '{query}' but couldn't find specific information. You might want to try a more specific search term."
             
-            return "\n".join(result_parts)
+            return result
             
         except requests.RequestException as e:
             return f"Error performing web search: {str(e)}"
         except Exception as e:
             return f"Unexpected error during web search: {str(e)}"
+    
+    def _fetch_results(self, query):
+        """Call the DuckDuckGo Instant Answer API and return the decoded JSON."""
+        # Using DuckDuckGo Instant Answer API (no API key required)
+        url = "https://api.duckduckgo.com/"
+        params = {
+            'q': query,
+            'format': 'json',
+            'no_html': '1',
+            'skip_disambig': '1'
+        }
+        
+        with requests.get(url, params=params, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            return read_json_stream(response.iter_content(chunk_size=16384))
+
+
+_env_result_store = None
+_env_result_store_lock = threading.Lock()  # Agents may be created from several threads (see load_test.py)
 
 
-def create_weather_enhanced_agent():
-    """Create and return an enhanced agent with math, web search, and weather tools."""
+def _get_env_result_store():
+    """Return the store named by AGENT_RESULT_STORE, shared by every agent in the process."""
+    global _env_result_store
+    with _env_result_store_lock:
+        if _env_result_store is None:
+            _env_result_store = ResultStore(os.getenv('AGENT_RESULT_STORE'))
+        return _env_result_store
+
+
+def create_weather_enhanced_agent(result_store=None, model=None, verbosity_level=1):
+    """Create and return an enhanced agent with math, web search, and weather tools.
+    
+    Tool calls are recorded in ``result_store`` if given, or in the SQLite file named
+    by the AGENT_RESULT_STORE environment variable if it is set. ``model`` defaults to
+    qwen2:7b on the local Ollama server.
+    """
     
     # Create the tools
     add_tool = AddNumbersTool()
+    sum_tool = SumNumbersTool()
     search_tool = WebSearchTool()
     weather_tool = WeatherTool()
     
+    # Attach the persistent result store, if any
+    if result_store is None and os.getenv('AGENT_RESULT_STORE'):
+        result_store = _get_env_result_store()
+    if result_store is not None:
+        result_store.warm_start(search_tool.name, max_age=search_tool.replay_max_age)
+        for tool in (add_tool, sum_tool, search_tool, weather_tool):
+            tool.result_store = result_store
+    
     # Create a model (using LiteLLM to connect to Ollama)
-    model = LiteLLMModel(
-        model_id="ollama/qwen2:7b",  # Specify ollama provider
-        api_base="http://localhost:11434"  # Ollama default endpoint
-    )
+    if model is None:
+        model = LiteLLMModel(
+            model_id="ollama/qwen2:7b",  # Specify ollama provider
+            api_base="http://localhost:11434"  # Ollama default endpoint
+        )
     
     # Create the agent with all tools
     agent = ToolCallingAgent(
-        tools=[add_tool, search_tool, weather_tool],
+        tools=[add_tool, sum_tool, search_tool, weather_tool],
         model=model,
         max_steps=5,  # Limit steps for simple tasks
-        verbosity_level=1  # Show some output
+        verbosity_level=verbosity_level  # Show some output by default
     )
     
     return agent
@@ -240,6 +348,7 @@ def main():
     print("✅ Agent created successfully!")
     print("🔧 Available tools:")
     print("   • add_numbers (adds two numbers)")
+    print("   • sum_numbers (adds up a list of numbers)")
     print("   • web_search (searches the web for information)")
     print("   • get_weather (gets real-time weather for any city)")
     print("\n" + "="*70)
@@ -251,6 +360,17 @@ def main():
         print("   Example: export OPENWEATHER_API_KEY='your_api_key_here'")
         print("-" * 70)
     
+    # Opt-in allocation profiling (AGENT_MEMPROFILE=<runs between snapshots>)
+    profiler = AllocationProfiler.from_env()
+    if profiler is not None:
+        profiler.start()
+        print(f"🧠 Memory profiling on: report every {profiler.snapshot_every} runs")
+        if profiler.install_signal_handler():
+            print(f"   Dump a report with 'memdump' or: kill -USR1 {os.getpid()}")
+        else:
+            print("   Dump a report with 'memdump'")
+        print("-" * 70)
+    
     # Example usage
     while True:
         try:
@@ -262,12 +382,19 @@ def main():
             
             if not user_input.strip():
                 continue
+            
+            if profiler is not None and user_input.strip().lower() == 'memdump':
+                profiler.dump()
+                continue
                 
             print(f"\n🤔 Processing: {user_input}")
             print("-" * 50)
             
             # Run the agent
-            result = agent.run(user_input)
+            if profiler is not None:
+                result = profiler.profile_run(agent.run, user_input)
+            else:
+                result = agent.run(user_input)
             
             print("-" * 50)
             print(f"✅ Result: {result}")